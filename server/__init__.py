@@ -12,10 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
-
 from flask import Flask
-from werkzeug.utils import import_string
+
+import configmodule
 
 
 def create_app():
@@ -26,12 +25,7 @@ def create_app():
     )
 
     # Setup flask config
-    if os.environ.get('FLASK_ENV') == 'test':
-        cfg = import_string('configmodule.TestConfig')()
-    elif os.environ.get('FLASK_ENV') == 'production':
-        cfg = import_string('configmodule.ProductionConfig')()
-    else:
-        cfg = import_string('configmodule.DevelopmentConfig')()
+    cfg = configmodule.get_config()
     app.config.from_object(cfg)
 
     # Init extentions
@@ -30,3 +30,13 @@ class TestConfig(Config):
     API_PROJECT = 'api-project'
     API_ROOT = 'api-root'
     GCS_BUCKET = 'gcs-bucket'
+
+
+def get_config():
+    """Returns the config object for the current FLASK_ENV."""
+    env = os.environ.get('FLASK_ENV')
+    if env == 'test':
+        return TestConfig()
+    if env == 'production':
+        return ProductionConfig()
+    return DevelopmentConfig()
@@ -30,6 +30,11 @@ _DEFAULT_X_RANGE = 10
 # Float prevents flooring on division.
 _DAYS_IN_LEAP = 366.0
 _DAYS_IN_NONLEAP = 365.0
+# Supported time formats, indexed by the number of '-' separators.
+_TIME_FORMATS = ('%Y', '%Y-%m', '%Y-%m-%d')
+# Y axis magnitudes (power of ten) and their tick label suffixes.
+_Y_SUFFIXES = ((15, 'Q'), (12, 'T'), (9, 'B'), (6, 'M'), (3, 'K'), (0, ''),
+               (-3, ''), (-6, 'e-6'), (-9, 'e-9'))
 
 
 def _float_to_datetime(date_float):
@@ -163,9 +168,7 @@ def _compute_y_ticks(y_min, y_max):
   y_diff = max([abs(y_max), abs(y_min), y_max - y_min])
   if y_diff >= 1e18:
     raise ValueError('Does not handle number larger than Quintillion.')
-  suffixes = [(15, 'Q'), (12, 'T'), (9, 'B'), (6, 'M'), (3, 'K'), (0, ''),
-              (-3, ''), (-6, 'e-6'), (-9, 'e-9')]
-  expn, name = max(x for x in suffixes if y_diff > math.pow(10, x[0]))
+  expn, name = max(x for x in _Y_SUFFIXES if y_diff > math.pow(10, x[0]))
   unit = math.pow(10, expn)
   y_diff = y_diff / unit  # Scale y_diff to 1 - 1000
   y_max /= unit
@@ -175,12 +178,14 @@ def _compute_y_ticks(y_min, y_max):
   idx = math.floor(math.log(math.pow(10, exp - scale), _LOG_BASE))
   step = 0.5 * math.pow(2, idx)
 
+  tick_step = step * math.pow(10, scale)
+
   res = []
   low_tick = 0.0
   while low_tick > y_min:
-    low_tick -= step * math.pow(10, scale)
+    low_tick -= tick_step
   for i in range(0, 6):
-    y_val = low_tick + i * step * math.pow(10, scale)
+    y_val = low_tick + i * tick_step
     if abs(y_val) < 1e-9:
       y_text = '0'
     elif expn == -3:
@@ -257,20 +262,19 @@ def compute(data, xbound, ybound):
     one_time_series = []
     for time_str, y_val in data_points:
       # Parse X input.
-      # Time in '%Y' or '%Y-%m' or '%Y-%m-%d' format.
+      # Time in '%Y' or '%Y-%m' or '%Y-%m-%d' format, picked by the number of
+      # '-' so that each value is parsed only once.
+      num_sep = time_str.count('-')
       try:
-        dt = datetime.datetime.strptime(time_str, '%Y')
+        dt = datetime.datetime.strptime(time_str, _TIME_FORMATS[num_sep])
+      except (IndexError, ValueError):
+        raise ValueError('Invalid time value: %s.' % time_str)
+      if num_sep == 0:
         x_val = dt.year
-      except ValueError:
-        try:
-          dt = datetime.datetime.strptime(time_str, '%Y-%m')
-          x_val = dt.year + dt.month / 12.0
-        except ValueError:
-          try:
-            dt = datetime.datetime.strptime(time_str, '%Y-%m-%d')
-            x_val = _datetime_to_float(dt)
-          except:
-            raise ValueError('Invalid time value: %s.' % time_str)
+      elif num_sep == 1:
+        x_val = dt.year + dt.month / 12.0
+      else:
+        x_val = _datetime_to_float(dt)
       x_set.add(x_val)
       # Parse Y input.
       try:
@@ -288,13 +292,16 @@ def compute(data, xbound, ybound):
   y_ticks = _compute_y_ticks(y_min, y_max)
   y_ticks_vals = [y[0] for y in y_ticks]
 
+  x_ticks_min = min(x_ticks_vals)
+  y_ticks_min = min(y_ticks_vals)
+
   # Put extra buffer on left and right side.
-  origin_val = (min(x_ticks_vals), min(y_ticks_vals))
+  origin_val = (x_ticks_min, y_ticks_min)
   origin_pos = (xbound[0] + _BUF_LEFT, ybound[1])
   x_scale = (xbound[1] - xbound[0] - _BUF_LEFT -
-             _BUF_RIGHT) / float(max(x_ticks_vals) - min(x_ticks_vals))
+             _BUF_RIGHT) / float(max(x_ticks_vals) - x_ticks_min)
   y_scale = (ybound[1] -
-             ybound[0]) / float(max(y_ticks_vals) - min(y_ticks_vals))
+             ybound[0]) / float(max(y_ticks_vals) - y_ticks_min)
   scale = (x_scale, y_scale)
 
   output_list = []
@@ -308,13 +315,13 @@ def compute(data, xbound, ybound):
 
   output_xticks = []
   for val, label in x_ticks:
-    x, y = transform((val, min(y_ticks_vals)), origin_val, origin_pos, scale)
+    x, y = transform((val, y_ticks_min), origin_val, origin_pos, scale)
     output_xticks.append((x, y, label))
 
   output_yticks = []
   origin_pos = (xbound[0], ybound[1])
   for val, label in y_ticks:
-    x, y = transform((min(x_ticks_vals), val), origin_val, origin_pos, scale)
+    x, y = transform((x_ticks_min, val), origin_val, origin_pos, scale)
     output_yticks.append((x, y, label))
 
   return output_list, output_xticks, output_yticks
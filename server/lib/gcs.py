@@ -13,8 +13,21 @@
 # limitations under the License.
 
 import collections
+import heapq
 from google.cloud import storage
 
+# Shared client, created on first use. Creating it at import time makes the
+# server crash when deploying to AppEngine.
+_storage_client = None
+
+
+def get_storage_client():
+  """Return the process-wide storage client, creating it if needed."""
+  global _storage_client
+  if _storage_client is None:
+    _storage_client = storage.Client()
+  return _storage_client
+
 
 def list_blobs(bucket_name, max_blobs):
   """Return a dictionary of three recent blobs in the bucket.
@@ -25,23 +38,16 @@ def list_blobs(bucket_name, max_blobs):
   Returns:
     Ordered dictionary of three recent blobs, most recent first.
   """
-  storage_client = storage.Client()
-  bucket = storage_client.get_bucket(bucket_name)
+  bucket = get_storage_client().get_bucket(bucket_name)
 
   blobs = bucket.list_blobs()
+  json_blobs = (b for b in blobs if b.name.endswith('.json'))
 
-  json_blobs = []
-  for b in blobs:
-    if b.name.endswith('.json'):
-      json_blobs.append(b)
-
-  recent_blobs = sorted(json_blobs, key=lambda blob: blob.updated, reverse=True)
+  # Only the most recent max_blobs are needed, so avoid sorting every blob.
+  recent_blobs = heapq.nlargest(max_blobs, json_blobs,
+                                key=lambda blob: blob.updated)
   d = collections.OrderedDict()
-  num_blobs = 0
   for b in recent_blobs:
     formatted_date = b.updated.strftime('%Y-%m-%d %H:%M:%S')
     d[formatted_date] = b
-    num_blobs += 1
-    if num_blobs == max_blobs:
-      break
-  return d
\ No newline at end of file
+  return d
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 """Library to build SVG of a line chart."""
-import cgi
+import html
 import io
 import logging
 import attr
@@ -39,8 +39,21 @@ _LEGEND_MARGIN = 15
 _LEGEND_FONT = 14
 _LEGEND_COLOR = '#80868b'
 
-
-@attr.s
+_SVG_TEMPLATE = ('<svg height="{h}px" width="{w}px" viewBox="0 0 {w} {h}" '
+                 'xmlns="http://www.w3.org/2000/svg" '
+                 'xmlns:xlink="http://www.w3.org/1999/xlink"{dom_id_str}>\n'
+                 '<style>.dcl-chart text, .dcl-title '
+                 '{{ font-family: roboto; }}</style>'
+                 '\n{title}{subtitle}{xtick}{ytick}{path}{legend}</svg>\n')
+# Placeholder chart returned when the data can not be plotted.
+_NO_DATA_SVG = ('<svg height="300px" width="300px" '
+                'xmlns="http://www.w3.org/2000/svg" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink">\n'
+                '<text x="30" y="30">No data found for the given parameters'
+                '</text>\n</svg>\n')
+
+
+@attr.s(slots=True)
 class Line(object):
   points = attr.ib()
   color = attr.ib()
@@ -48,7 +61,7 @@ class Line(object):
   dom_id = attr.ib(default='')
 
 
-@attr.s
+@attr.s(slots=True)
 class Legend(object):
   color = attr.ib()
   text = attr.ib()
@@ -68,7 +81,8 @@ def build_title(title):
     return (
         '<g class="dcl-title"><text x="{}" y="{}" font-size="{}">{}'
         '</text></g>\n'
-        .format(_X_MARGIN, _TITLE_HEIGHT, _TITLE_FONT, cgi.escape(title)))
+        .format(_X_MARGIN, _TITLE_HEIGHT, _TITLE_FONT,
+                html.escape(title, quote=False)))
   return ''
 
 
@@ -91,7 +105,7 @@ def build_subtitle(subtitles, title_h):
       component += ('<g class="dcl-title"><text x="{}" y="{}" font-size="{}">{}'
                     '</text></g>\n').format(
                         _X_MARGIN, title_h + (i + 1) * _SUBTITLE_HEIGHT,
-                        _SUBTITLE_FONT, cgi.escape(subtitles[i]))
+                        _SUBTITLE_FONT, html.escape(subtitles[i], quote=False))
   return component
 
 
@@ -121,7 +135,7 @@ def build_legend(legends, x):
         '</text></g>'.format(i * 20, legend.color, legend.style,
                              _DASH_LEGEND_LEN,
                              _DASH_LEGEND_MARGIN, _LEGEND_FONT, _LEGEND_COLOR,
-                             cgi.escape(legend.text)),
+                             html.escape(legend.text, quote=False)),
         file=textbuffer,
         end='')
   print('</g>', file=textbuffer)
@@ -204,11 +218,10 @@ def build_path(path_data, lines):
   """
   textbuffer = io.StringIO()
   for path, line in zip(path_data, lines):
-    print('<path d="', file=textbuffer, end='')
     # Draw the line.
-    for i, (x, y) in enumerate(path):
-      command = ('M' if i == 0 else 'L')
-      print('{} {} {} '.format(command, x, y), file=textbuffer, end='')
+    commands = ''.join('{} {} {} '.format('M' if i == 0 else 'L', x, y)
+                       for i, (x, y) in enumerate(path))
+    print('<path d="{}'.format(commands), file=textbuffer, end='')
 
     print(
         '" stroke="{}" stroke-width="2" fill="none" '
@@ -262,26 +275,16 @@ def build_svg(lines,
   try:
     path_data, xtick_data, ytick_data = cc.compute(
         [line.points for line in lines], xbound, ybound)
-    return ('<svg height="{h}px" width="{w}px" viewBox="0 0 {w} {h}" '
-            'xmlns="http://www.w3.org/2000/svg" '
-            'xmlns:xlink="http://www.w3.org/1999/xlink"{dom_id_str}>\n'
-            '<style>.dcl-chart text, .dcl-title '
-            '{{ font-family: roboto; }}</style>'
-            '\n{title}{subtitle}{xtick}{ytick}{path}{legend}</svg>'
-            '\n').format(
-                h=h,
-                w=w,
-                dom_id_str=(' id="{}"'.format(dom_id) if dom_id else ''),
-                title=build_title(title),
-                subtitle=build_subtitle(subtitles, title_h),
-                xtick=build_xtick(xtick_data),
-                ytick=build_ytick(ytick_data, draw_width, is_percent),
-                path=build_path(path_data, lines),
-                legend=build_legend(legends, w - legend_width))
+    return _SVG_TEMPLATE.format(
+        h=h,
+        w=w,
+        dom_id_str=(' id="{}"'.format(dom_id) if dom_id else ''),
+        title=build_title(title),
+        subtitle=build_subtitle(subtitles, title_h),
+        xtick=build_xtick(xtick_data),
+        ytick=build_ytick(ytick_data, draw_width, is_percent),
+        path=build_path(path_data, lines),
+        legend=build_legend(legends, w - legend_width))
   except ValueError as e:
     logging.error('build_svg got error "%s" with lines:\n%s.', e, lines)
-    return ('<svg height="300px" width="300px" '
-            'xmlns="http://www.w3.org/2000/svg" '
-            'xmlns:xlink="http://www.w3.org/1999/xlink">\n'
-            '<text x="30" y="30">No data found for the given parameters'
-            '</text>\n</svg>\n')
\ No newline at end of file
+    return _NO_DATA_SVG
\ No newline at end of file
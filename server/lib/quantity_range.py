@@ -15,7 +15,9 @@
 """Library to handle quantity range."""
 import attr
 import enum
+import functools
 
+@enum.unique
 class QuantityType(enum.Enum):
   YEAR = 1
   USDOLLAR = 2
@@ -28,6 +30,18 @@ QR_TO_SCHEMA = {
     QuantityType.ROOM: 'Room',
 }
 
+# Quantity range prefixes with their type and display name. Longer prefixes
+# come first so that e.g. 'Years' is matched before 'Year'.
+_PREFIXES = (
+    ('Years', QuantityType.YEAR, 'Years'),
+    ('Year', QuantityType.YEAR, 'Years'),
+    ('Rooms', QuantityType.ROOM, 'Rooms'),
+    ('Room', QuantityType.ROOM, 'Rooms'),
+    ('USDollar', QuantityType.USDOLLAR, '$'),
+)
+
+_MAGNITUDE_SUFFIXES = ('', 'K', 'M', 'B', 'T')
+
 
 def human_format(num):
   # .3 sets precision to 3 decimals, g removes insignificant 0s.
@@ -37,7 +51,7 @@ def human_format(num):
     magnitude += 1
     num /= 1000.0
   return '{}{}'.format('{:f}'.format(num).rstrip('0').rstrip('.'),
-                       ['', 'K', 'M', 'B', 'T'][magnitude])
+                       _MAGNITUDE_SUFFIXES[magnitude])
 
 
 @attr.s(hash=True, eq=True)
@@ -116,38 +130,25 @@ class QuantityRange(object):
     return True
 
 
+@functools.lru_cache(maxsize=1024)
 def parse(qr_str):
   """Parse a string into a QuantityRange object.
 
+  Results are cached, so the returned object is shared and must not be
+  modified by the caller.
+
   Args:
     qr_str: A string reprsentation of quantity range.
 
   Returns:
     A QuantityRange object.
   """
-  qr_obj = QuantityRange()
-  if qr_str.startswith('Years'):
-    qr_obj.type = QuantityType.YEAR
-    qr_obj.name = 'Years'
-    prefix = 'Years'
-  elif qr_str.startswith('Year'):
-    qr_obj.type = QuantityType.YEAR
-    qr_obj.name = 'Years'
-    prefix = 'Year'
-  elif qr_str.startswith('Rooms'):
-    qr_obj.type = QuantityType.ROOM
-    qr_obj.name = 'Rooms'
-    prefix = 'Rooms'
-  elif qr_str.startswith('Room'):
-    qr_obj.type = QuantityType.ROOM
-    qr_obj.name = 'Rooms'
-    prefix = 'Room'
-  elif qr_str.startswith('USDollar'):
-    qr_obj.type = QuantityType.USDOLLAR
-    qr_obj.name = '$'
-    prefix = 'USDollar'
+  for prefix, qr_type, name in _PREFIXES:
+    if qr_str.startswith(prefix):
+      break
   else:
     raise ValueError('Invalid quantity range string %s' % qr_str)
+  qr_obj = QuantityRange(type=qr_type, name=name)
 
   range_str = qr_str.replace(prefix, '')
   if len(range_str.split('To')) == 2:
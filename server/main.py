@@ -18,13 +18,14 @@ This module contains the request handler codes and the main app.
 """
 
 import collections
+import concurrent.futures
+import functools
 import json
 import logging
 import os
 
 import flask
 from flask import request, redirect, url_for
-from google.cloud import storage
 import jinja2
 
 import services.datacommons as dc
@@ -32,7 +33,7 @@ from models import datachart_handler
 from models import barchart_handler
 from lib import line_chart
 from lib import translator
-from lib.gcs import list_blobs
+from lib.gcs import get_storage_client, list_blobs
 import lib.barchart_template as btemp
 
 from __init__ import create_app
@@ -42,6 +43,9 @@ _MAX_BLOBS = 1
 
 _SA_FEED_BUCKET = 'datacommons-frog-feed'
 
+# Compile the bar chart template once instead of on every request.
+_BARCHART_TEMPLATE = jinja2.Environment().from_string(source=btemp.t)
+
 logging.basicConfig(
     level=logging.DEBUG,
     format='%(asctime)s %(levelname)s %(lineno)d : %(message)s')
@@ -52,12 +56,15 @@ app = create_app()
 GCS_BUCKET = app.config['GCS_BUCKET']
 
 
+# Suffixes of the per-stats-var url arguments, e.g. mid, mid1, mid2...
+_PLACE_ARG_IDX = ('',) + tuple(
+    str(i) for i in range(1, datachart_handler.MAX_POPOBS_TYPES + 1))
+
+
 def get_place_args(get_values):
     place_args = collections.OrderedDict()
-    all_idx = [''] + [str(i)
-                      for i in range(1, datachart_handler.MAX_POPOBS_TYPES + 1)]
     all_dcids = set()
-    for idx in all_idx:
+    for idx in _PLACE_ARG_IDX:
         dcids = get_values.getlist('mid{}'.format(idx))
         if dcids:
             place_args[idx] = (
@@ -113,8 +120,8 @@ def place():
         'place_overview.html', place_type=chosen_type, place_name=place_name)
 
 
-@cache.cached(timeout=3600 * 24)
 @app.route('/api/placeid2dcid/<path:placeid>')
+@cache.cached(timeout=3600 * 24)
 def api_placeid2dcid(placeid):
     """
     API endpoint to get dcid based on place id.
@@ -130,19 +137,17 @@ def api_placeid2dcid(placeid):
 
 
 # Getting the blob at module level will make the server crash when deploying
-# to AppEngine. Make it in a function and cache for 30 days will effectively
-# achieve the same caching effect.
-@cache.memoize(timeout=3600 * 24 * 30)  # Cache for 30 days.
+# to AppEngine. Load it lazily on first use and keep the parsed mapping in
+# process memory, so lookups don't re-pickle the whole dict from the cache.
+@functools.lru_cache(maxsize=1)
 def get_placeid2dcid():
-    # Instantiates a client
-    storage_client = storage.Client()
-    bucket = storage_client.get_bucket(GCS_BUCKET)
+    bucket = get_storage_client().get_bucket(GCS_BUCKET)
     blob = bucket.get_blob('placeid2dcid.json')
     return json.loads(blob.download_as_string())
 
 
-@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 @app.route('/api/mapinfo/<path:dcid>')
+@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 def api_mapinfo(dcid):
     """
     TODO(wsws/boxu): This function only works for the US, which doesn't have
@@ -240,8 +245,8 @@ def api_similar_places(dcid):
     return api_similar_places_helper(dcid, stats_var)
 
 
-@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 @app.route('/api/interesting-place/<path:dcid>')
+@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 def api_interesting_places(dcid):
     """
     Get the intersting places for a given place.
@@ -249,8 +254,8 @@ def api_interesting_places(dcid):
     return dc.get_interesting_places([dcid])
 
 
-@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 @app.route('/api/nearby-place/<path:dcid>')
+@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 def api_nearby_places(dcid):
     """
     Get the nearby places for a given place.
@@ -271,8 +276,35 @@ def api_nearby_places(dcid):
     return json.dumps(data)
 
 
-@cache.memoize(timeout=3600 * 24)  # Cache for one day.
+# TODO(boxu): make the stats_vars in a config.
+# Ranking label, get_related_place() positional args and keyword args.
+_RANKING_STATS = (
+    ('Population', ('Person', 'count', 'measuredValue'),
+     {'measurement_method': 'CensusACS5yrSurvey'}),
+    ('Median Income', ('Person', 'income', 'medianValue'),
+     {'pvs_string': 'age^Years15Onwards^incomeStatus^WithIncome',
+      'measurement_method': 'CensusACS5yrSurvey'}),
+    ('Median Age', ('Person', 'age', 'medianValue'),
+     {'measurement_method': 'CensusACS5yrSurvey'}),
+    ('Unemployment Rate', ('Person', 'unemploymentRate', 'measuredValue'),
+     {'measurement_method': 'BLSSeasonallyUnadjusted'}),
+    ('Crime per capita', ('CriminalActivities', 'count', 'measuredValue'),
+     {'pvs_string': 'crimeType^UCR_CombinedCrime', 'is_per_capita': True}),
+)
+
+
+def _get_related_place_in_context(dcid, args, kwargs):
+    """Calls get_related_place() from a worker thread.
+
+    The cache needs an application context, which is not shared with the
+    request thread.
+    """
+    with app.app_context():
+        return get_related_place(dcid, *args, **kwargs)
+
+
 @app.route('/api/ranking/<path:dcid>')
+@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 def api_ranking(dcid):
     """
     Get the ranking information for a given place.
@@ -292,48 +324,25 @@ def api_ranking(dcid):
             break
     selected_parents.append('country/USA')
     parent_names['country/USA'] = 'United States'
+    # Fetch the rankings for all parents concurrently, they are independent
+    # mixer calls. Cap the threads at the mixer session's connection pool size
+    # so pooled keep-alive connections are not discarded.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(
+            len(selected_parents) * len(_RANKING_STATS),
+            dc.MIXER_POOL_SIZE)) as executor:
+        futures = [
+            (label, parent, executor.submit(
+                _get_related_place_in_context, dcid, args,
+                dict(kwargs, same_place_type=True, within_place=parent)))
+            for parent in selected_parents
+            for label, args, kwargs in _RANKING_STATS
+        ]
     result = collections.defaultdict(list)
-    # TODO(boxu): make the stats_vars in a config.
-    for parent in selected_parents:
-        # Population ranking
-        result['Population'].append({
-            'name': parent_names[parent],
-            'data': get_related_place(
-                dcid, 'Person', 'count', 'measuredValue',
-                measurement_method='CensusACS5yrSurvey',
-                same_place_type=True, within_place=parent)})
-        # Median income
-        result['Median Income'].append({
-            'name': parent_names[parent],
-            'data': get_related_place(
-                dcid, 'Person', 'income', 'medianValue',
-                pvs_string='age^Years15Onwards^incomeStatus^WithIncome',
-                measurement_method='CensusACS5yrSurvey',
-                same_place_type=True, within_place=parent)})
-        # Median age
-        result['Median Age'].append({
+    for label, parent, future in futures:
+        result[label].append({
             'name': parent_names[parent],
-            'data': get_related_place(
-                dcid, 'Person', 'age', 'medianValue',
-                measurement_method='CensusACS5yrSurvey',
-                same_place_type=True, within_place=parent)})
-        # Unemployment rate
-        result['Unemployment Rate'].append({
-            'name': parent_names[parent],
-            'data': get_related_place(
-                dcid, 'Person', 'unemploymentRate', 'measuredValue',
-                measurement_method='BLSSeasonallyUnadjusted',
-                same_place_type=True, within_place=parent)})
-        # Crime
-        result['Crime per capita'].append({
-            'name': parent_names[parent],
-            'data': get_related_place(
-                dcid, 'CriminalActivities', 'count', 'measuredValue',
-                pvs_string='crimeType^UCR_CombinedCrime',
-                same_place_type=True, within_place=parent, is_per_capita=True)})
-    result['label'] = [
-        'Population', 'Median Income', 'Median Age', 'Unemployment Rate',
-        'Crime per capita']
+            'data': future.result()})
+    result['label'] = [label for label, _, _ in _RANKING_STATS]
     for label in result['label']:
         no_data = True
         for item in result[label]:
@@ -346,8 +355,8 @@ def api_ranking(dcid):
     return result
 
 
-@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 @app.route('/api/parent-place/<path:dcid>')
+@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 def api_parent_place(dcid):
     """
     Get the child places for a place.
@@ -358,6 +367,8 @@ def api_parent_place(dcid):
     # "California" but not "United States": https://browser.datacommons.org/kg?dcid=geoId/0649670
     # Here calling get_parent_place twice to get to the top parents.
     parents1 = get_parent_place(dcid)
+    if not parents1:
+        return json.dumps([])
     parents2 = get_parent_place(parents1[-1]['dcid'])
     return json.dumps(parents1 + parents2)
 
@@ -370,10 +381,12 @@ def get_parent_place(dcid):
     payload = dc.send_request(url, req_json=req_json)
     parents = payload[dcid].get('out', [])
     parents.sort(key=lambda x: x['dcid'], reverse=True)
-    for i in range(len(parents)):
-        if len(parents[i]['types']) > 1:
-            parents[i]['types'] = list(
-                filter(lambda x: not x.startswith('AdministrativeArea'), parents[i]['types']))
+    for parent in parents:
+        if len(parent['types']) > 1:
+            parent['types'] = [
+                t for t in parent['types']
+                if not t.startswith('AdministrativeArea')
+            ]
     return parents
 
 
@@ -418,14 +431,16 @@ def linechart():
     # See https://docs.google.com/document/d/1dW9izgDzllbhrIJm-aZxWlapMIueVX6WQlImiiDIAFs/edit?usp=sharing
     # for details
 
+    single_pv = len(place_args) == 1
     dcid_legend = set()
     for idx, (dcids, args) in place_args.items():
-        if len(place_args) == 1:  # Single PV
+        legend = args['legend']
+        if single_pv:
             for dcid in dcids:
                 if dcid not in color_map:
                     color_map[dcid] = datachart_handler.get_color(
                         len(color_map))
-                text = args['legend']
+                text = legend
                 if rich_legend:
                     text = place_name[dcid] + ' ' + text
                 if text:
@@ -437,7 +452,7 @@ def linechart():
             color = color_map[idx]
             for dcid in dcids:
                 if single_place:
-                    text = args['legend']
+                    text = legend
                     if rich_legend:
                         text = place_name[dcid] + ' ' + text
                     if text:
@@ -455,12 +470,12 @@ def linechart():
                                     color='grey', text=place_name[dcid], style=style))
                             dcid_legend.add(dcid)
                     else:
-                        text = place_name[dcid] + ' ' + args['legend']
+                        text = place_name[dcid] + ' ' + legend
                         legends.append(
                             line_chart.Legend(color=color, text=text, style=style))
     lines = []
     for pd in plot_data:
-        if len(place_args) == 1:
+        if single_pv:
             color = color_map[pd['dcid']]
             style = ''
         else:
@@ -492,9 +507,7 @@ def barchart():
     # TODO(boxu): make ChartHandler a smaller object that only handles args.
     bch = barchart_handler.BarChartHandler(request.args)
     data = bch.get_data()
-    env = jinja2.Environment()
-    template = env.from_string(source=btemp.t)
-    resp = flask.Response(template.render(data))
+    resp = flask.Response(_BARCHART_TEMPLATE.render(data))
     resp.headers['Access-Control-Allow-Origin'] = '*'
     resp.headers['Content-Type'] = 'image/svg+xml; charset=utf-8'
     resp.headers['Vary'] = 'Accept-Encoding'
@@ -17,9 +17,8 @@
 import collections
 import logging
 
-import jinja2
-
-import services.datacommons
+from cache import cache
+from services import datacommons
 import models.datachart_handler as ch
 import lib.quantity_range as qr
 
@@ -48,6 +47,17 @@ AGGREGATED_QUANT_RANGE = {
     p: [qr.parse(qs) for qs in v] for p, v in AGGREGATED_BUCKET.items()
 }
 
+# Observation properties to match, including the observation date.
+OBS_DATE_PROPS = ch.OBS_PROPS + ('observationDate',)
+
+
+@cache.memoize(timeout=3600 * 24)  # Cache for one day.
+def get_place_names(places):
+  """Get the name of each place in a tuple of place dcids."""
+  return {
+      k: v[0] for k, v in datacommons.get_property_values(places, 'name').items()
+  }
+
 
 def filter_and_sort(values):
   if not values[0]['prop'].startswith(UNIT):
@@ -95,11 +105,11 @@ def top_values(place_vals,
   Returns:
     sorted list of (place id, val) tuples
   """
-  top_vals = []
   sorted_obs = sorted(place_vals.items(), key=lambda x: x[1], reverse=is_top)
-  for i, (dcid, val) in enumerate(sorted_obs):
-    if i < num_to_include or (is_comp and i == len(sorted_obs) - 1):
-      top_vals.append((dcid, val))
+  top_vals = sorted_obs[:max(num_to_include, 0)]
+  # The comparison stats also keep the last place.
+  if is_comp and len(top_vals) < len(sorted_obs):
+    top_vals.append(sorted_obs[-1])
   return top_vals
 
 
@@ -125,7 +135,7 @@ def filter_pops_obs(pops, po_args):
         # constraints is not null, but pop doesn't have any PVs
         continue
       if (len(pop['propertyValues']) == len(po_args['constraints']) and
-          cpv.viewitems() <= pop['propertyValues'].viewitems() and
+          cpv.items() <= pop['propertyValues'].items() and
           cp in pop['propertyValues']):
         kept_pop.append(pop_id)
   return kept_pop, cp
@@ -142,7 +152,7 @@ def filter_obs(pop, po_args):
     the desired observation.
   """
   for obs in pop['observations']:
-    if ch.check_obs(obs, po_args, ch.OBS_PROPS + ['observationDate']):
+    if ch.check_obs(obs, po_args, OBS_DATE_PROPS):
       return obs
   return None
 
@@ -169,11 +179,12 @@ class BarChartHandler(ch.ChartHandler):
     return [{'prop': str(key), 'val': val} for key, val in temp.items()]
 
   def add_name(self, values):
-    for i in range(len(values)):
+    for value in values:
+      prop = value['prop']
       try:
-        values[i]['name'] = qr.parse(values[i]['prop']).display_text()
+        value['name'] = qr.parse(prop).display_text()
       except ValueError:
-        values[i]['name'] = values[i]['prop'].replace(
+        value['name'] = prop.replace(
             'HousingUnit', '').replace('Occupied', ' Occupied')
     return values
 
@@ -185,17 +196,7 @@ class BarChartHandler(ch.ChartHandler):
     layout['width'] = self.width
     layout['height'] = self.height
     layout['title'] = self.title
-    layout['subtitle1_height'] = 0
-    layout['subtitle2_height'] = 0
-    if self.subtitle:
-      lines = self.subtitle.split('\n')
-      if len(lines) > 2:
-        raise ValueError('Maximum allows subtitle lines=2.')
-      layout['subtitle1'] = lines[0]
-      layout['subtitle1_height'] = ch.CHART_SUBTITLE_HEIGHT
-      if len(lines) == 2:
-        layout['subtitle2'] = lines[1]
-        layout['subtitle2_height'] = ch.CHART_SUBTITLE_HEIGHT
+    layout.update(self.subtitle_layout_data())
     layout['margin'] = ch.CHART_MARGIN
     layout['title_height'] = ch.CHART_TITLE_HEIGHT if self.title else 0
     layout['label_width'] = label_width
@@ -220,11 +221,8 @@ class BarChartHandler(ch.ChartHandler):
     values = []
     val_max = 0
     for k, v in place_vals:
-      d = {}
-      d['name'] = place_names[k]
-      d['val'] = v
       val_max = max(val_max, v)
-      values.append(d)
+      values.append({'name': place_names[k], 'val': v})
     data['data'] = values  # Find a better upper bound
     data['values_max'] = val_max  # Find a better upper bound
     data.update(self.bar_layout_data(data))
@@ -234,21 +232,21 @@ class BarChartHandler(ch.ChartHandler):
     data = {}
     colors = [ch.COLORS[0]] * len(places_data)
     data['colors'] = colors
+    places_by_dcid = collections.defaultdict(list)
+    for place in places_data:
+      places_by_dcid[place['dcid']].append(place)
     values = []
     val_max = 0
     for dcid in dcids:
-      for place in places_data:
-        if dcid == place['dcid']:
-          d = {}
-          dcid = place['dcid']
-          d['name'] = place_names[dcid]
-          d['val'] = 0
-          for point in place['points']:
-            if point[0] == od:
-              d['val'] = point[1]
-              break
-          val_max = max(val_max, d['val'])
-          values.append(d)
+      name = place_names[dcid]
+      for place in places_by_dcid.get(dcid, []):
+        val = 0
+        for point in place['points']:
+          if point[0] == od:
+            val = point[1]
+            break
+        val_max = max(val_max, val)
+        values.append({'name': name, 'val': val})
     data['data'] = values  # Find a better upper bound
     data['values_max'] = val_max  # Find a better upper bound
     data.update(self.bar_layout_data(data))
@@ -263,14 +261,13 @@ class BarChartHandler(ch.ChartHandler):
 
     values = []
     val_max = 0
-    for _, pl_data in ordered_place_data.items():
-      d = {}
-      d['name'] = pl_data['name']
-      d['val'] = pl_data['val']
-      if d['val'] < 0 and d['name'] in ['Michigan', 'United States']:
-        d['val'] = 1.23456789
-      val_max = max(val_max, d['val'])
-      values.append(d)
+    for pl_data in ordered_place_data.values():
+      name = pl_data['name']
+      val = pl_data['val']
+      if val < 0 and name in ('Michigan', 'United States'):
+        val = 1.23456789
+      val_max = max(val_max, val)
+      values.append({'name': name, 'val': val})
     data['data'] = values  # Find a better upper bound
     data['values_max'] = val_max  # Find a better upper bound
     data.update(self.bar_layout_data(data))
@@ -416,7 +413,9 @@ class BarChartHandler(ch.ChartHandler):
               'geoId/26': 1496.0
           }
       else:
-        places = [place_dcid] + ch.get_ancestor_places(place_dcid)
+        # Dedupe in order, e.g. when the place is itself one of the ancestors.
+        places = list(collections.OrderedDict.fromkeys(
+            [place_dcid] + ch.get_ancestor_places(place_dcid)))
 
         # pl_dcid: pop_dcid
         place_pops = datacommons.get_populations(places, po_args['popType'],
@@ -437,10 +436,7 @@ class BarChartHandler(ch.ChartHandler):
         place_vals['geoId/26'] = -999
         place_vals['country/USA'] = -999
 
-      place_names = {
-          k: v[0]
-          for k, v in datacommons.get_property_values(places, 'name').items()
-      }
+      place_names = get_place_names(tuple(places))
 
       if pc:
         place_population = ch.get_place_population(places)
@@ -14,13 +14,10 @@
 
 """Handlers for data charts."""
 
-import base64
 import datetime
-import logging
-import re
-import zlib
 import os
 
+from cache import cache
 from services import datacommons
 from models import stat_config_pb2
 
@@ -35,7 +32,7 @@ URL_FETCH_DEADLINE = 180  # seconds
 # https://standards.google/guidelines/google-material/color/palettes.html#brand-palette
 # https://standards.google/guidelines/google-material/color/palettes.html#expanded-palette
 # with weight 600, 200, 800, 400
-COLORS = [
+COLORS = (
     '#1A73E8',
     '#D93025',
     '#F9AB00',
@@ -68,7 +65,7 @@ COLORS = [
     '#FF63B8',
     '#AF5CF7',
     '#4ECDE6',
-]
+)
 CONTRAST_COLOR = '#8AB4F8'
 CHART_MARGIN = 20
 CHART_LEGEND_CHAR_WIDTH = 8
@@ -78,11 +75,15 @@ CHART_X_AXIS_HEIGHT = 20
 CHART_Y_AXIS_WIDTH = 45
 CHART_BAR_VERT_MARGIN = 3
 MAX_POPOBS_TYPES = 100
-OBS_PROPS = ['measurementMethod', 'observationPeriod', 'measuredProp']
+OBS_PROPS = ('measurementMethod', 'observationPeriod', 'measuredProp')
+
+# Markers of aggregated observations, ignored when matching observations.
+_DC_AGGREGATE = 'DataCommonsAggregate'
+_DC_AGGREGATE_PREFIX = 'dcAggregate/'
 
 DEFAULT_LINE_CHART_WIDTH = 600
 
-_DASHES = ['', '5, 5', '10, 5', '5, 10', '1, 5', '5, 1', '0.9', '5, 5, 1, 5']
+_DASHES = ('', '5, 5', '10, 5', '5, 10', '1, 5', '5, 1', '0.9', '5, 5, 1, 5')
 
 # TODO(b/155484547) Read this from config.
 LATEST_POPULATION_YEAR = 2018
@@ -204,15 +205,21 @@ def parse_pop_obs_args(get_params, suffix=''):
   return args
 
 
+def _strip_aggregate(obs_arg):
+  """Strip the aggregate marker from an observation argument."""
+  if obs_arg == _DC_AGGREGATE:
+    return ''
+  if obs_arg.startswith(_DC_AGGREGATE_PREFIX):
+    return obs_arg[len(_DC_AGGREGATE_PREFIX):]
+  return obs_arg
+
+
 def check_obs(obs, po_args, props=OBS_PROPS):
   """Check with an observation matches the query argument."""
-  keep = True
   for key in props:
-    obs_arg = re.sub(r'(^DataCommonsAggregate$|^dcAggregate/)', '',
-                     obs.get(key, ''))
-    keep = keep and obs_arg == po_args.get(key, '')
-
-  return keep and po_args['statType'] in obs
+    if _strip_aggregate(obs.get(key, '')) != po_args.get(key, ''):
+      return False
+  return po_args['statType'] in obs
 
 
 def filter_val(obs_list, po_args):
@@ -255,6 +262,7 @@ def filter_place_obs_vals(places, place_obs, pop_obs_args):
   return data, names
 
 
+@cache.memoize(timeout=3600 * 24)  # Cache for one day.
 def get_and_filter_places_in(dcid, ptype):
   """Get and filter the places in another place.
 
@@ -277,8 +285,7 @@ def get_and_filter_places_in(dcid, ptype):
       '2017',
       measurement_method='CensusACS5yrSurvey')
   pop_place = {v: k for k, v in place_pops.items()}
-  return set(
-      [pop_place[k] for k, v in place_obs.items() if v > MIN_PLACE_POP])
+  return {pop_place[k] for k, v in place_obs.items() if v > MIN_PLACE_POP}
 
 
 def get_ancestor_places(dcid):
@@ -319,19 +326,21 @@ def get_plot_data(place_args, pc, gr):
 
   for idx, (dcids, po_args) in place_args.items():
     all_places |= set(dcids)
+    # Everything in the key after the dcid only depends on po_args.
+    key_parts = [
+        po_args['measuredProp'], po_args['measurementMethod'],
+        po_args.get('observationPeriod', ''),
+        po_args.get('statType', '').replace('Value', ''),
+        po_args.get('measurementDenominator', ''),
+        po_args.get('measurementQualifier', ''),
+        po_args.get('scalingFactor', ''), po_args['popType']
+    ]
+    ps = sorted(po_args['constraints'].keys())
+    for p in ps:
+      key_parts.extend([p, po_args['constraints'][p]])
+    key_suffix = '^'.join(key_parts)
     for dcid in dcids:
-      key_parts = [
-          dcid, po_args['measuredProp'], po_args['measurementMethod'],
-          po_args.get('observationPeriod', ''),
-          po_args.get('statType', '').replace('Value', ''),
-          po_args.get('measurementDenominator', ''),
-          po_args.get('measurementQualifier', ''),
-          po_args.get('scalingFactor', ''), po_args['popType']
-      ]
-      ps = sorted(po_args['constraints'].keys())
-      for p in ps:
-        key_parts.extend([p, po_args['constraints'][p]])
-      key = '^'.join(key_parts)
+      key = '{}^{}'.format(dcid, key_suffix)
       keys.add(key)
       key_to_idx[key] = idx
 
@@ -339,15 +348,17 @@ def get_plot_data(place_args, pc, gr):
   result = []
   for key, data in chart_data.items():
     dcid = key.split('^')[0]
-    points = [(date, v) for date, v in data['obsTimeSeries']['val'].items()]
+    idx = key_to_idx[key]
+    series = data['obsTimeSeries']
+    points = [(date, v) for date, v in series['val'].items()]
     result.append({
-        'idx': key_to_idx[key],
+        'idx': idx,
         'dcid': dcid,
-        'name': data['obsTimeSeries']['placeName'],
+        'name': series['placeName'],
         'points': sorted(points, key=lambda x: x[0]),
-        'domid': place_args[key_to_idx[key]][1]['domId']
+        'domid': place_args[idx][1]['domId']
     })
-    dcid_name[dcid] = data['obsTimeSeries']['placeName']
+    dcid_name[dcid] = series['placeName']
   for dcid in all_places:
     if dcid not in dcid_name:
       dcid_name[dcid] = dcid
@@ -378,13 +389,11 @@ def get_plot_data(place_args, pc, gr):
       d['points'] = pc_data
   elif gr:
     for d in result:
-      gr_data = []
-      for i, point in enumerate(d['points']):
-        if i > 0:
-          grow_rate = ((d['points'][i][1] - d['points'][i - 1][1]) /
-                        abs(d['points'][i - 1][1])) * 100
-          gr_data.append((d['points'][i][0], grow_rate))
-      d['points'] = gr_data
+      points = d['points']
+      d['points'] = [
+          (date, (val - prev_val) / abs(prev_val) * 100)
+          for (_, prev_val), (date, val) in zip(points, points[1:])
+      ]
   return result, dcid_name
 
 
@@ -403,6 +412,24 @@ class ChartHandler(object):
     self.title = title if title else ''
     self.subtitle = subtitle if subtitle else ''
 
+  def subtitle_layout_data(self):
+    """Layout of the (up to two) subtitle lines, shared by all charts.
+
+    Returns:
+      A dict with the subtitle text and height of each line.
+    """
+    layout = {'subtitle1_height': 0, 'subtitle2_height': 0}
+    if self.subtitle:
+      lines = self.subtitle.split('\n')
+      if len(lines) > 2:
+        raise ValueError('Maximum allows subtitle lines=2.')
+      layout['subtitle1'] = lines[0]
+      layout['subtitle1_height'] = CHART_SUBTITLE_HEIGHT
+      if len(lines) == 2:
+        layout['subtitle2'] = lines[1]
+        layout['subtitle2_height'] = CHART_SUBTITLE_HEIGHT
+    return layout
+
   def chart_layout_data(self, plot_data, has_legend=False):
     """Common chart layout calculations based on data passed into the template.
 
@@ -420,17 +447,7 @@ class ChartHandler(object):
     layout['title'] = self.title
     layout['margin'] = CHART_MARGIN
     layout['title_height'] = CHART_TITLE_HEIGHT if self.title else 0
-    layout['subtitle1_height'] = 0
-    layout['subtitle2_height'] = 0
-    if self.subtitle:
-      lines = self.subtitle.split('\n')
-      if len(lines) > 2:
-        raise ValueError('Maximum allows subtitle lines=2.')
-      layout['subtitle1'] = lines[0]
-      layout['subtitle1_height'] = CHART_SUBTITLE_HEIGHT
-      if len(lines) == 2:
-        layout['subtitle2'] = lines[1]
-        layout['subtitle2_height'] = CHART_SUBTITLE_HEIGHT
+    layout.update(self.subtitle_layout_data())
     layout['x_axis_height'] = CHART_X_AXIS_HEIGHT
     layout['y_axis_width'] = CHART_Y_AXIS_WIDTH
     layout['chart_area_height'] = (
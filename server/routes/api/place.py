@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import collections
+import heapq
 import json
 
 from flask import Blueprint
@@ -21,7 +22,7 @@ from cache import cache
 from services.datacommons import fetch_data
 from routes.api.stats import get_stats_wrapper
 
-WANTED_PLACE_TYPES = ["Country", "State", "County", "City"]
+WANTED_PLACE_TYPES = frozenset(["Country", "State", "County", "City"])
 
 # Define blueprint
 bp = Blueprint(
@@ -53,7 +54,9 @@ def child_fetch(dcid):
       post=True
     )
     places = response[dcid].get('in', [])
-    dcid_str = '^'.join(sorted(map(lambda x: x['dcid'], places)))
+    if not places:
+        return {}
+    dcid_str = '^'.join(sorted(x['dcid'] for x in places))
     pop = json.loads(get_stats_wrapper(dcid_str, 'TotalPopulation'))
 
     pop = {
@@ -72,6 +75,6 @@ def child_fetch(dcid):
                 })
                 break
     for place_type in result:
-        result[place_type].sort(key=lambda x: x['pop'], reverse=True)
-        result[place_type] = result[place_type][:10]
+        result[place_type] = heapq.nlargest(
+          10, result[place_type], key=lambda x: x['pop'])
     return result
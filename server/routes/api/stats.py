@@ -35,5 +35,6 @@ def get_stats_wrapper(dcid_str, stats_var):
 @bp.route('/api/stats/<path:stats_var>')
 def stats(stats_var):
     """Handler to get the observation given stats var."""
-    place_dcids = request.args.getlist('dcid')
+    # Dedupe and sort so that equivalent requests share one cache entry.
+    place_dcids = sorted(set(request.args.getlist('dcid')))
     return get_stats_wrapper('^'.join(place_dcids), stats_var)
@@ -13,14 +13,8 @@
 # limitations under the License.
 
 from flask import Blueprint
-from flask import flash
-from flask import g
-from flask import redirect
 from flask import render_template
-from flask import request
-from flask import url_for
 
-from cache import cache
 from lib.gcs import list_blobs
 
 _MAX_BLOBS = 1
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import collections
-
 from flask import Blueprint
 from flask import render_template
 
@@ -47,7 +45,7 @@ def index():
           'dcid': place['dcid'],
           'name': place.get('name', place['dcid'])
         })
-        countries['Country'].sort(key=lambda x: x['name'])
+    countries['Country'].sort(key=lambda x: x['name'])
     return render_template('sitemap.html', place_by_type=countries)
 
 
@@ -55,18 +53,12 @@ def index():
 @cache.memoize(timeout=3600 * 24)  # Cache for one day.
 def node(dcid):
     child_places = child_fetch(dcid)
-    place_by_type = collections.defaultdict(list)
+    # child_fetch already groups the children by place type.
+    place_by_type = {}
     for place_type, childs in child_places.items():
-        for child in childs:
-            for place_type in child.get('types', [""]):
-                if not place_type.startswith('AdministrativeArea'):
-                    place_by_type[place_type].append({
-                      'dcid': child['dcid'],
-                      'name': child['name']
-                    })
-                    break
-    for place_type in place_by_type:
-        place_by_type[place_type].sort(key=lambda x: x['name'])
+        place_by_type[place_type] = sorted(
+          ({'dcid': child['dcid'], 'name': child['name']} for child in childs),
+          key=lambda x: x['name'])
 
     return render_template(
       'sitemap.html', place_by_type=place_by_type, dcid=dcid)
@@ -23,15 +23,11 @@ import zlib
 import urllib
 
 import requests
-from werkzeug.utils import import_string
 from google.cloud import secretmanager
 
-if os.environ.get('FLASK_ENV') == 'test':
-    cfg = import_string('configmodule.TestConfig')()
-elif os.environ.get('FLASK_ENV') == 'production':
-    cfg = import_string('configmodule.ProductionConfig')()
-else:
-    cfg = import_string('configmodule.DevelopmentConfig')()
+import configmodule
+
+cfg = configmodule.get_config()
 
 API_ROOT = cfg.API_ROOT
 API_PROJECT = cfg.API_PROJECT
@@ -69,6 +65,23 @@ API_ENDPOINTS = {
 # The default value to limit to
 _MAX_LIMIT = 100
 
+# Max pooled connections to the mixer. Covers the 8 gunicorn threads (see
+# Dockerfile) as well as the fan-out of a single ranking request in main.py.
+MIXER_POOL_SIZE = 16
+
+# Shared session so that requests to the mixer reuse pooled connections
+# instead of opening a new TCP/TLS connection each time.
+# The session is shared across all request threads.
+_session = requests.Session()
+_session.mount(API_ROOT,
+               requests.adapters.HTTPAdapter(pool_maxsize=MIXER_POOL_SIZE))
+
+# Headers sent with every mixer request.
+_HEADERS = {
+    'x-api-key': DC_API_KEY,
+    'Content-Type': 'application/json'
+}
+
 
 # ----------------------------- WRAPPER FUNCTIONS -----------------------------
 
@@ -78,7 +91,7 @@ def search(query_text, max_results):
         DC_API_KEY,
         urllib.parse.quote(query_text.replace(',', ' ')),
         max_results)
-    response = requests.get(req_url)
+    response = _session.get(req_url)
     if response.status_code != 200:
         raise ValueError(
             'Response error: An HTTP {} code was returned by the mixer. '
@@ -111,13 +124,8 @@ def get_property_labels(dcids, out=True):
     payload = send_request(url, req_json={'dcids': dcids})
 
     # Return the results based on the orientation
-    results = {}
-    for dcid in dcids:
-        if out:
-            results[dcid] = payload[dcid]['outLabels']
-        else:
-            results[dcid] = payload[dcid]['inLabels']
-    return results
+    labels = 'outLabels' if out else 'inLabels'
+    return {dcid: payload[dcid][labels] for dcid in dcids}
 
 
 def get_property_values(dcids,
@@ -136,13 +144,10 @@ def get_property_values(dcids,
 
     # Create the result format for when dcids is provided as a list.
     unique_results = collections.defaultdict(set)
+    direction = 'out' if out else 'in'
     for dcid in dcids:
         # Get the list of nodes based on the direction given.
-        nodes = []
-        if dcid in payload and out:
-            nodes = payload[dcid].get('out', [])
-        elif dcid in payload and not out:
-            nodes = payload[dcid].get('in', [])
+        nodes = payload.get(dcid, {}).get(direction, [])
 
         # Add nodes to unique_results if it is not empty
         for node in nodes:
@@ -152,7 +157,7 @@ def get_property_values(dcids,
                 unique_results[dcid].add(node['value'])
 
     # Make sure each dcid is in the results dict, and convert sets to lists.
-    results = {dcid: sorted(list(unique_results[dcid])) for dcid in dcids}
+    results = {dcid: sorted(unique_results[dcid]) for dcid in dcids}
     return results
 
 
@@ -161,21 +166,16 @@ def get_triples(dcids, limit=_MAX_LIMIT):
     url = API_ROOT + API_ENDPOINTS['get_triples']
     payload = send_request(url, req_json={'dcids': dcids, 'limit': limit})
 
-    # Create a map from dcid to list of triples.
-    results = collections.defaultdict(list)
-    for dcid in dcids:
-        # Make sure each dcid is mapped to an empty list.
-        results[dcid]
-
-        # Add triples as appropriate
-        for t in payload[dcid]:
-            if 'objectId' in t:
-                results[dcid].append(
-                    (t['subjectId'], t['predicate'], t['objectId']))
-            elif 'objectValue' in t:
-                results[dcid].append(
-                    (t['subjectId'], t['predicate'], t['objectValue']))
-    return dict(results)
+    # Create a map from dcid to list of triples, every dcid is mapped even if
+    # it has no triples.
+    return {
+        dcid: [
+            (t['subjectId'], t['predicate'],
+             t['objectId'] if 'objectId' in t else t['objectValue'])
+            for t in payload[dcid] if 'objectId' in t or 'objectValue' in t
+        ]
+        for dcid in dcids
+    }
 
 
 def get_places_in(dcids, place_type):
@@ -249,7 +249,7 @@ def get_observations(dcids,
 
 
 def get_pop_obs(dcid):
-    url = API_ROOT + API_ENDPOINTS['get_pop_obs'] + '?dcid={}'.format(dcid)
+    url = API_ROOT + API_ENDPOINTS['get_pop_obs']
     params = {'dcid': dcid}
     return send_request(url, req_json=params, compress=True, post=False)
 
@@ -277,15 +277,11 @@ def get_place_obs(place_type,
 def query(query_string):
     # Get the API Key and perform the POST request.
     logging.info("[ Mixer Request ]: query")
-    headers = {
-        'x-api-key': DC_API_KEY,
-        'Content-Type': 'application/json'
-    }
     req_url = API_ROOT + API_ENDPOINTS['query']
-    response = requests.post(
+    response = _session.post(
         req_url,
         json={'sparql': query_string},
-        headers=headers,
+        headers=_HEADERS,
         timeout=60)
     if response.status_code != 200:
         raise ValueError(
@@ -338,17 +334,13 @@ def send_request(req_url, req_json={}, compress=False, post=True):
     Returns:
       The payload returned by sending the POST/GET request formatted as a dict.
     """
-    headers = {
-        'x-api-key': DC_API_KEY,
-        'Content-Type': 'application/json'
-    }
     logging.info("Send request to %s", req_url)
 
     # Send the request and verify the request succeeded
     if post:
-        response = requests.post(req_url, json=req_json, headers=headers)
+        response = _session.post(req_url, json=req_json, headers=_HEADERS)
     else:
-        response = requests.get(req_url, params=req_json, headers=headers)
+        response = _session.get(req_url, params=req_json, headers=_HEADERS)
 
     if response.status_code != 200:
         raise ValueError(
@@ -388,7 +380,7 @@ def _format_expand_payload(payload, new_key, must_exist=[]):
     # Ensure all dcids in must_exist have some entry in results.
     for dcid in must_exist:
         results[dcid]
-    return {k: sorted(list(v)) for k, v in results.items()}
+    return {k: sorted(v) for k, v in results.items()}
 
 
 def _flatten_results(result, default_value=None):
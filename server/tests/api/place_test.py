@@ -82,3 +82,14 @@ class TestRoute(unittest.TestCase):
             }
           ]
         }
+
+    @patch('routes.api.place.fetch_data')
+    @patch('routes.api.place.get_stats_wrapper')
+    def test_no_child(self, mock_get_stats, mock_fetch_data):
+        mock_fetch_data.side_effect = (
+          lambda url, req, compress, post: {'geoId/99': {}})
+
+        response = app.test_client().get('/api/place/child/geoId/99')
+        assert response.status_code == 200
+        assert json.loads(response.data) == {}
+        mock_get_stats.assert_not_called()
@@ -0,0 +1,28 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest.mock import patch
+
+from main import app
+
+
+class TestRoute(unittest.TestCase):
+    @patch('routes.api.stats.get_stats_wrapper')
+    def test_stats(self, mock_get_stats):
+        mock_get_stats.return_value = '{}'
+        response = app.test_client().get(
+            '/api/stats/Count_Person?dcid=geoId/06&dcid=geoId/02&dcid=geoId/06')
+        assert response.status_code == 200
+        mock_get_stats.assert_called_once_with('geoId/02^geoId/06', 'Count_Person')
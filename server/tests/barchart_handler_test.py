@@ -0,0 +1,90 @@
+# Copyright 2020 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from parameterized import parameterized
+import unittest
+from unittest.mock import patch
+
+from main import app
+from models import barchart_handler as bch
+
+
+class BarChartTest(unittest.TestCase):
+
+  @patch('models.barchart_handler.datacommons.get_place_obs')
+  @patch('models.barchart_handler.ch.get_and_filter_places_in')
+  def test_place_obs_chart(self, mock_places_in, mock_get_place_obs):
+    mock_places_in.return_value = {'geoId/06085', 'geoId/06001'}
+
+    def place_obs(dcid, name, val):
+      return {
+          'place': dcid,
+          'name': name,
+          'observations': [{
+              'measuredProp': 'count',
+              'measurementMethod': 'CensusACS5yrSurvey',
+              'measuredValue': val
+          }]
+      }
+    mock_get_place_obs.return_value = [
+        place_obs('geoId/06085', 'Santa Clara County', 200),
+        place_obs('geoId/06001', 'Alameda County', 100),
+        place_obs('geoId/06075', 'San Francisco County', 300),
+    ]
+    response = app.test_client().get(
+        '/datachart/bar?t=op&mid=geoId/06&placet=County&popt=Person'
+        '&mprop=count&st=measuredValue&od=2018&n=2&order=highest')
+    assert response.status_code == 200
+    assert b'Santa Clara County' in response.data
+    assert b'Alameda County' in response.data
+    assert b'San Francisco County' not in response.data
+    mock_places_in.assert_called_once_with('geoId/06', 'County')
+    mock_get_place_obs.assert_called_once_with('County', '2018', 'Person', {})
+
+
+class FilterPopsObsTest(unittest.TestCase):
+
+  _POPS = {
+      'dc/p/female5': {
+          'popType': 'Person',
+          'propertyValues': {'gender': 'Female', 'age': 'Years5To9'}
+      },
+      'dc/p/male5': {
+          'popType': 'Person',
+          'propertyValues': {'gender': 'Male', 'age': 'Years5To9'}
+      },
+      'dc/p/female': {
+          'popType': 'Person',
+          'propertyValues': {'gender': 'Female'}
+      },
+      'dc/p/person': {
+          'popType': 'Person'
+      },
+      'dc/p/household': {
+          'popType': 'Household'
+      },
+  }
+
+  @parameterized.expand([
+      ('subset_match', {'gender': 'Female', 'age': '_'},
+       ['dc/p/female5'], 'age'),
+      ('subset_no_match', {'gender': 'Other', 'age': '_'}, [], 'age'),
+      ('no_constraints', {}, ['dc/p/person'], None),
+  ])
+  def test_filter_pops_obs(self, name, constraints, expected_pops,
+                           expected_cp):
+    po_args = {'popType': 'Person', 'constraints': constraints}
+    kept_pops, cp = bch.filter_pops_obs(self._POPS, po_args)
+    self.assertEqual(kept_pops, expected_pops)
+    self.assertEqual(cp, expected_cp)
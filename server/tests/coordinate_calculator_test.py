@@ -70,6 +70,15 @@ class ComputeTest(unittest.TestCase):
     self.assertEqual(xticks, expected_x_ticks)
     self.assertEqual(yticks, expected_y_ticks)
 
+  @parameterized.expand([
+      ('bad_year', '19x9'),
+      ('bad_month', '1999-13'),
+      ('too_many_parts', '1999-01-01-01'),
+  ])
+  def test_invalid_time(self, name, time_str):
+    with self.assertRaises(ValueError):
+      cc.compute([[(time_str, 1)]], (30, 360), (30, 200))
+
 
 class ComputeYTickTest(unittest.TestCase):
 
@@ -18,6 +18,8 @@ import logging
 import json
 from unittest.mock import patch
 
+from parameterized import parameterized
+
 from main import app
 
 class TestRoute(unittest.TestCase):
@@ -25,12 +27,12 @@ class TestRoute(unittest.TestCase):
         response = app.test_client().get('/factcheck')
         assert response.status_code == 308  # redirect to /factcheck/
 
-    def test_faq(self):
-        response = app.test_client().get('/factcheck/faq')
-        assert response.status_code == 200
-
-    def test_blog(self):
-        response = app.test_client().get('/factcheck/blog')
+    @parameterized.expand([
+        ('faq', '/factcheck/faq'),
+        ('blog', '/factcheck/blog'),
+    ])
+    def test_static_page(self, name, url):
+        response = app.test_client().get(url)
         assert response.status_code == 200
 
     @patch('routes.factcheck.list_blobs')
@@ -14,26 +14,19 @@
 
 import unittest
 
+from parameterized import parameterized
+
 from main import app
 
 
 class TestStaticPage(unittest.TestCase):
-    def test_gni(self):
-        response = app.test_client().get('/gni')
-        assert response.status_code == 200
-        assert b"Welcome to Data Commons." in response.data
-
-    def test_download(self):
-        response = app.test_client().get('/download')
-        assert response.status_code == 200
-        assert b"By using these API/Data" in response.data
-
-    def test_download2(self):
-        response = app.test_client().get('/download2')
-        assert response.status_code == 200
-        assert b"For every State" in response.data
-
-    def test_scatter(self):
-        response = app.test_client().get('/scatter')
+    @parameterized.expand([
+        ('gni', '/gni', b"Welcome to Data Commons."),
+        ('download', '/download', b"By using these API/Data"),
+        ('download2', '/download2', b"For every State"),
+        ('scatter', '/scatter', b"Select two variables from the left menu"),
+    ])
+    def test_static_page(self, name, url, expected_text):
+        response = app.test_client().get(url)
         assert response.status_code == 200
-        assert b"Select two variables from the left menu" in response.data
+        assert expected_text in response.data
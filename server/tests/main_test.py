@@ -89,4 +89,54 @@ class TestApiParentPlaces(unittest.TestCase):
             "provenanceId": "dc/sm3m2w3",
             "types": ["Country"]
           }
-        ]
\ No newline at end of file
+        ]
+
+    @patch('main.get_parent_place')
+    def test_api_parent_places_cache(self, mock_get_parent_place):
+        mock_get_parent_place.return_value = [{'dcid': 'geoId/01'}]
+        response = app.test_client().get('/api/parent-place/geoId/01001')
+        assert response.status_code == 200
+        assert mock_get_parent_place.call_count == 2
+
+        response = app.test_client().get('/api/parent-place/geoId/01001')
+        assert response.status_code == 200
+        assert mock_get_parent_place.call_count == 2
+
+    @patch('main.get_parent_place')
+    def test_api_parent_places_no_parent(self, mock_get_parent_place):
+        mock_get_parent_place.return_value = []
+        response = app.test_client().get('/api/parent-place/earth')
+        assert response.status_code == 200
+        assert json.loads(response.data) == []
+        mock_get_parent_place.assert_called_once_with('earth')
+
+
+class TestApiRanking(unittest.TestCase):
+    @patch('main.get_related_place')
+    @patch('main.api_parent_place')
+    def test_api_ranking(self, mock_api_parent_place, mock_get_related_place):
+        mock_api_parent_place.return_value = json.dumps([
+            {'dcid': 'geoId/06085', 'name': 'Santa Clara County'},
+            {'dcid': 'geoId/06', 'name': 'California'},
+            {'dcid': 'country/USA', 'name': 'United States'},
+        ])
+
+        def side_effect(dcid, population_type, measured_property, stat_type,
+                        **kwargs):
+            if measured_property == 'age':
+                return {}
+            return {'within': kwargs['within_place']}
+        mock_get_related_place.side_effect = side_effect
+
+        response = app.test_client().get('/api/ranking/geoId/0649670')
+        assert response.status_code == 200
+        result = json.loads(response.data)
+        assert result['label'] == [
+            'Population', 'Median Income', 'Unemployment Rate',
+            'Crime per capita']
+        assert result['Population'] == [
+            {'name': 'Santa Clara County', 'data': {'within': 'geoId/06085'}},
+            {'name': 'California', 'data': {'within': 'geoId/06'}},
+            {'name': 'United States', 'data': {'within': 'country/USA'}},
+        ]
+        assert 'Median Age' not in result
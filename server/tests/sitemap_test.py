@@ -68,6 +68,8 @@ class TestRoute(unittest.TestCase):
         assert b'county 1' in response.data
         assert b'county 2' in response.data
         assert b'city 1' in response.data
+        assert b'<h3>County</h3>' in response.data
+        assert b'<h3>City</h3>' in response.data
 
         # Test the child_fetch() cache
         response = app.test_client().get('/sitemap/geoId/06')
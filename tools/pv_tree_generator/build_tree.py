@@ -24,9 +24,10 @@ SEARCH_SPECS, SEARCH_VALS = util._read_search_pvs()
 def build_tree_recursive(pos, level, pop_obs_spec, stat_vars, show_all, 
     parent=None):
     """Recursively build the ui tree"""
+    pos_props = set(pos.properties)
     #get the property of the ui node
     if parent:
-        property_diff = (set(pos.properties) - set(parent.pop_obs_spec.
+        property_diff = (pos_props - set(parent.pop_obs_spec.
             properties)).pop()
         parent_pv = parent.pv
     else:
@@ -52,7 +53,7 @@ def build_tree_recursive(pos, level, pop_obs_spec, stat_vars, show_all,
     child_pos = []
     for c_pos in pop_obs_spec[level+1]:
         if (pos.pop_type == c_pos.pop_type and 
-            set(pos.properties) < set(c_pos.properties)):
+            pos_props < set(c_pos.properties)):
                 child_pos.append(c_pos)
 
     for sv in stat_vars[pos.key]:
@@ -63,13 +64,11 @@ def build_tree_recursive(pos, level, pop_obs_spec, stat_vars, show_all,
             value_ui_pv[property_diff] = sv.pv[property_diff]
             value_ui_node = util.UiNode(pos, value_ui_pv, False, property_diff)
             
-            in_search = True
-            for prop, val in value_ui_pv.items():
-                in_search = (in_search and (value_ui_node.pop_type, 
-                    value_ui_node.mprop, prop) in SEARCH_SPECS and val in SEARCH_VALS)
-                if not in_search:
-                    break
-
+            pop_type = value_ui_node.pop_type
+            mprop = value_ui_node.mprop
+            in_search = all(
+                (pop_type, mprop, prop) in SEARCH_SPECS and val in SEARCH_VALS
+                for prop, val in value_ui_pv.items())
 
             value_blob = {
                 'populationType': value_ui_node.pop_type,
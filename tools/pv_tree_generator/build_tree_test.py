@@ -14,12 +14,21 @@
 
 import unittest
 from unittest.mock import patch
+import functools
 import json
 from collections import defaultdict
 
 import build_tree
 from util import _read_pop_obs_spec, _read_stat_var
 
+
+@functools.lru_cache(maxsize=None)
+def _load_test_triples():
+    """read test_triples.json once, it is shared by all the mock calls"""
+    with open("test_triples.json", "r") as f:
+        return json.load(f)
+
+
 class BuildTreeTest(unittest.TestCase):
     """testing build_tree"""
 
@@ -38,7 +47,7 @@ class BuildTreeTest(unittest.TestCase):
     @staticmethod
     def get_triples_(dcids):
         """read the triples with predicates in the specified list"""
-        triples = json.load(open("test_triples.json", "r"))
+        triples = _load_test_triples()
         results = defaultdict(list)
         #skip if the predicate is not in the list
         predicates = ["measuredProperty", "populationType", "statType",
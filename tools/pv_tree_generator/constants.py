@@ -86,20 +86,20 @@ ICD10 = {
         '(U00-U99) Special Purpose Codes'
 }
 
-AGES = set([
+AGES = frozenset([
     'Less than 5 Years', '5 - 17 Years', '18 - 24 Years', 'Less than 25 Years',
     '25 - 34 Years', '25 - 44 Years', '35 - 44 Years', '45 - 54 Years',
     '45 - 64 Years', '55 - 59 Years', '60 - 61 Years', '62 - 64 Years',
     '65 - 74 Years', 'More than 75 Years'
 ])
 
-IDC10_AGES = set([
+IDC10_AGES = frozenset([
     'Less than 1 Years', '1 - 4 Years', '5 - 14 Years', '15 - 24 Years',
     '25 - 34 Years', '35 - 44 Years', '45 - 54 Years', '55 - 64 Years',
     '65 - 74 Years', '75 - 84 Years', 'More than 85 Years'
 ])
 
-RACES = set([
+RACES = frozenset([
     'American Indian And Alaska Native Alone', 'Asian Alone',
     'Black Or African American Alone',
     'Native Hawaiian And Other Pacific Islander Alone', 'Some Other Race Alone',
@@ -17,11 +17,14 @@
 import requests
 import json
 import collections
+import functools
 from google.cloud import secretmanager
 
 API_ROOT = 'https://datacommons.endpoints.datcom-mixer-staging.cloud.goog'
 
+@functools.lru_cache(maxsize=None)
 def get_api_key():
+    """Read the api key from Secret Manager once and reuse it."""
     secret_client = secretmanager.SecretManagerServiceClient()
     secret_name = secret_client.secret_version_path(
         'datcom-mixer-staging', 'mixer-api-key', '1')
@@ -21,14 +21,16 @@ from build_tree import build_tree
 def main():
     pop_obs_spec = util._read_pop_obs_spec()
     stat_vars = util._read_stat_var()
-    f_json = open("./hierarchy.json","w")
     data = [{},{}]
     for vertical in constants.VERTICALS:
       root = build_tree(vertical, pop_obs_spec[vertical], stat_vars, False)
       data[0][vertical] = root
       root_search = build_tree(vertical, pop_obs_spec[vertical], stat_vars, True)
       data[1][vertical] = root_search
-    json.dump(data, f_json)
+    # Open the output only once the tree is built, so a failed run does not
+    # truncate the existing file.
+    with open("./hierarchy.json", "w") as f_json:
+        json.dump(data, f_json)
     return
     
 if __name__ == "__main__":
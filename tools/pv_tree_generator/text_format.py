@@ -14,10 +14,13 @@
 
 """Format UI text."""
 
+import functools
 import re
+
 import constants
 
 PREFIX = ['BLS_', 'USC_', 'CDC_', 'FBI_', 'UCR_']
+_PREFIX_RE = re.compile('|'.join(map(re.escape, PREFIX)))
 DEFAULT_RANK = 100
 
 RANGE_TEXT = {
@@ -28,9 +31,49 @@ RANGE_TEXT = {
     'Room': 'Rooms',
 }
 
+# Titles displayed as-is instead of being split from camelCase.
+SPECIAL_TITLES = {
+    'PropertyCrime': 'Property',
+    'ViolentCrime': 'Violent',
+    'Nonveteran': 'Non Veteran',
+    'UCFENoStateUnemploymentInsurance':
+        'Unemployment Compensation for Federal Employees',
+    'UCXOnly': 'Unemployment Compensation for Ex-servicemembers',
+}
+
+# The enum is in camelCase, this separates the words with space.
+_CAMEL_CASE_RE = re.compile('([a-z|0-9])([A-Z])')
+# Assume US is always a single word in population property and value.
+_US_BEFORE_RE = re.compile(r'(\S)US')
+_US_AFTER_RE = re.compile(r'US(\S)')
+
+# Titles kept for each property when not showing all children.
+TARGET_TITLES = {
+    'race': constants.RACES,
+    'educationalAttainment': frozenset(constants.EDUCATIONS.keys()),
+    'causeOfDeath': frozenset(constants.ICD10.values()),
+    'naics': frozenset(constants.NAICS.values()),
+    'detailedLevelOfSchool': frozenset(constants.GRADE.keys()),
+    'drugPrescribed': frozenset(constants.DEA_DRUGS.values()),
+}
+
+# Properties whose enum values are ranges, sorted by their lower bound.
+RANGE_PROPS = frozenset([
+    'age', 'householderAge', 'income', 'numberOfRooms', 'grossRent',
+    'homeValue'
+])
 
+# Display order of NAICS titles, used to sort naics children.
+NAICS_ORDER = {name: idx for idx, name in enumerate(constants.NAICS.values())}
+
+
+@functools.lru_cache(maxsize=None)
 def format_title(title):
-  """Format a raw title text to displayed text in UI."""
+  """Format a raw title text to displayed text in UI.
+
+  The same property values recur across many nodes of the tree, so results
+  are cached per title.
+  """
   if title in constants.ICD10:
     return constants.ICD10[title]
   if title in constants.NAICS:
@@ -42,19 +85,10 @@ def format_title(title):
   for key in RANGE_TEXT:
     if title.startswith(key):
       return format_range(title, key)
-  if title == 'PropertyCrime':
-    return 'Property'
-  if title == 'ViolentCrime':
-    return 'Violent'
-  if title == 'Nonveteran':
-    return 'Non Veteran'
-  if title == 'UCFENoStateUnemploymentInsurance':
-    return 'Unemployment Compensation for Federal Employees'
-  if title == 'UCXOnly':
-    return 'Unemployment Compensation for Ex-servicemembers'
-
-  for word in PREFIX:
-    title = title.replace(word, '')
+  if title in SPECIAL_TITLES:
+    return SPECIAL_TITLES[title]
+
+  title = _PREFIX_RE.sub('', title)
   
   if title == "HispanicOrLatinoRace":
     title = title.replace('Race','')
@@ -62,15 +96,10 @@ def format_title(title):
   if title.startswith('EnrolledIn') and title != 'EnrolledInSchool':
     title = title.replace('EnrolledIn', '').replace('Grade', 'Grade ')
 
-  # The enum is in camelCase, this separates the words with space.
-  title = re.sub('([a-z|0-9])([A-Z])', r'\g<1> \g<2>', title)
-
-  # Assume US is always a single word in population property and value.
-  title = re.sub(r'(\S)US', r'\g<1> US', title)
-  title = re.sub(r'US(\S)', r'US \g<1>', title)
-  chars = list(title)
-  chars[0] = chars[0].upper()
-  return ''.join(chars)
+  title = _CAMEL_CASE_RE.sub(r'\g<1> \g<2>', title)
+  title = _US_BEFORE_RE.sub(r'\g<1> US', title)
+  title = _US_AFTER_RE.sub(r'US \g<1>', title)
+  return title[:1].upper() + title[1:]
 
 
 def format_range(range_enum, prefix):
@@ -111,18 +140,12 @@ def rangeLow(o):
 def sort_func(prop):
   """Return a sort function for children nodes."""
   # Range enums
-  if prop in [
-      'age', 'householderAge', 'income', 'numberOfRooms', 'grossRent',
-      'homeValue'
-  ]:
+  if prop in RANGE_PROPS:
     return rangeLow
   elif prop == 'educationalAttainment':
     return lambda o: constants.EDUCATIONS.get(o['title'], DEFAULT_RANK)
   elif prop == 'naics':
-    order = {}
-    for idx, name in enumerate(list(constants.NAICS.values())):
-      order[name] = idx
-    return lambda o: order.get(o['title'], DEFAULT_RANK)
+    return lambda o: NAICS_ORDER.get(o['title'], DEFAULT_RANK)
   elif prop == 'detailedLevelOfSchool':
     return lambda o: constants.GRADE.get(o['title'], DEFAULT_RANK)
   else:
@@ -138,18 +161,8 @@ def filter_and_sort(prop, children, show_all):
         target_titles = constants.IDC10_AGES
       else:
         target_titles = constants.AGES
-    if prop == 'race':
-      target_titles = constants.RACES
-    if prop == 'educationalAttainment':
-      target_titles = set(list(constants.EDUCATIONS.keys()))
-    if prop == 'causeOfDeath':
-      target_titles = set(list(constants.ICD10.values()))
-    if prop == 'naics':
-      target_titles = set(list(constants.NAICS.values()))
-    if prop == 'detailedLevelOfSchool':
-      target_titles = set(list(constants.GRADE.keys()))
-    if prop == 'drugPrescribed':
-      target_titles = set(list(constants.DEA_DRUGS.values()))
+    else:
+      target_titles = TARGET_TITLES.get(prop)
 
   if target_titles:
     used_children = [c for c in children if c['title'] in target_titles]
@@ -22,6 +22,9 @@ import dc_request as dc
 
 class PopObsSpec(object):
   """Represents a StatisticalPopulation & Observation spec."""
+  __slots__ = ('pop_type', 'mprop', 'stats', 'properties', 'cpv', 'name',
+               'prop_all', 'key')
+
   def __init__(self, pop_type, mprop, stats, properties, cpv, name):
       self.pop_type = pop_type #population type, string
       self.mprop = mprop #measured property, string
@@ -34,6 +37,8 @@ class PopObsSpec(object):
       
 class StatVar(object):
     """Represents a StatisticalVariable"""
+    __slots__ = ('pop_type', 'mprop', 'stats', 'pv', 'dcid', 'key')
+
     def __init__(self, pop_type , mprop , stats , pv , dcid):
       self.pop_type = pop_type #population_type, string
       self.mprop = mprop #measured property, string
@@ -55,6 +60,8 @@ class StatVar(object):
 
 class UiNode:
     """Class holds the data of a node in the pv menu tree. """
+    __slots__ = ('pop_obs_spec', 'is_prop', 'prop', 'pv')
+
     def __init__(self, pop_obs_spec, pv, is_prop, prop=None):
       self.pop_obs_spec = pop_obs_spec #pop_obs_spec for this node.
       self.is_prop = is_prop #is the node a "Property" or a "Value" node.